@@ -3,7 +3,8 @@
 Collection of uncategorized tools
 """
 from enum import IntEnum, Enum
-from typing import List, Any
+from itertools import islice
+from typing import List, Any, Iterable, Iterator
 
 __title__ = 'dpytools'
 __author__ = 'ChrisDewa'
@@ -135,25 +136,28 @@ class EmojiNumbers(str, Enum):
     ZERO = Emoji.ZERO.value
 
 
-def chunkify(input_list: List[Any],
+def chunkify(input_list: Iterable[Any],
              max_number: int
-             ) -> List[List[Any]]:
+             ) -> Iterator[List[Any]]:
     """
-    Splits a list into :n: sized chunks
+    Splits an iterable into :n: sized chunks
 
     Parameters
     ----------
-    input_list: :class:`List[Any]`
-        The list to make chunks from
+    input_list: :class:`Iterable[Any]`
+        The list (or any other iterable) to make chunks from
     max_number: :class:`int`
         The maximum amount of items per chunk
 
     Yields
     ------
-    Chunks of size equal or lower to *max_number*
+    Lists of size equal or lower to *max_number*
     """
-    for i in range(0, len(input_list), max_number):
-        yield input_list[i:i + max_number]
+    if max_number < 1:
+        raise ValueError("max_number should be 1 or greater.")
+    it = iter(input_list)
+    while chunk := list(islice(it, max_number)):
+        yield chunk
 
 
 def chunkify_string_list(input_list: List[str],
@@ -180,13 +184,18 @@ def chunkify_string_list(input_list: List[str],
     ------
     :class:`List[List[str]]`
     """
-    if any([len(item) > max_length - separator_length for item in input_list]):
+    if max_number < 1:
+        raise ValueError("max_number should be 1 or greater.")
+    if any(len(item) > max_length - separator_length for item in input_list):
         raise ValueError(f"All items should be of length {max_length} or less.")
 
-    for i in range(0, len(input_list), max_number):
-        n = max_number
-        l = input_list[i:i + n]
-        while len(''.join(opt + '_' * separator_length for opt in l)) - separator_length > max_length:
-            n -= 1
-            l = input_list[i:i + n]
-        yield l
+    i, n = 0, len(input_list)
+    while i < n:
+        # the first item doesn't carry a separator
+        j, running = i, -separator_length
+        while (j < n and j - i < max_number
+               and running + len(input_list[j]) + separator_length <= max_length):
+            running += len(input_list[j]) + separator_length
+            j += 1
+        yield input_list[i:j]
+        i = j
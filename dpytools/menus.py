@@ -6,7 +6,7 @@ All menus are reaction based.
 """
 
 import asyncio
-from copy import copy
+from itertools import accumulate, product
 from typing import List, Optional, Union
 
 import discord
@@ -14,7 +14,56 @@ from discord import Embed
 from discord.ext import commands
 from discord.ext.commands import Context
 
-from dpytools import EmojiNumbers, Emoji, chunkify_string_list, Color
+from dpytools import Emoji, chunkify_string_list, Color
+
+# plain string values of the emojis used by the menus
+_LAST = Emoji.LAST_TRACK.value
+_REV = Emoji.REVERSE.value
+_PLAY = Emoji.PLAY.value
+_NEXT = Emoji.NEXT_TRACK.value
+_PAUSE = Emoji.PAUSE.value
+_X = Emoji.X.value
+_THUMBS_UP = Emoji.THUMBS_UP.value
+
+_NUM_EMOJIS = (
+    Emoji.ONE.value,
+    Emoji.TWO.value,
+    Emoji.THREE.value,
+    Emoji.FOUR.value,
+    Emoji.FIVE.value,
+    Emoji.SIX.value,
+    Emoji.SEVEN.value,
+    Emoji.EIGHT.value,
+    Emoji.NINE.value,
+    Emoji.TEN.value,
+)
+
+_ARROW_NAVIGATION = (_LAST, _REV, _PLAY, _NEXT)
+_ARROW_CONTROLS = (_PAUSE, _X)
+# every reaction set arrows can display, keyed by which navigation emojis are shown
+_PAGE_REACTIONS = {
+    shown: tuple(e for e, visible in zip(_ARROW_NAVIGATION, shown) if visible) + _ARROW_CONTROLS
+    for shown in product((False, True), repeat=len(_ARROW_NAVIGATION))
+}
+_ARROW_ACTIONS = {
+    _LAST: 'first',
+    _REV: 'prev',
+    _PLAY: 'next',
+    _NEXT: 'last',
+    _X: 'close',
+    _PAUSE: 'pause',
+}
+
+_CONFIRM_REACTIONS = (_THUMBS_UP, _X)
+_CONFIRM_REACTIONS_SET = frozenset(_CONFIRM_REACTIONS)
+
+# next page index for a multichoice navigation reaction, given the current page and page count
+_MULTICHOICE_ADJUST = {
+    _LAST: lambda head, pages: 0,
+    _REV: lambda head, pages: head - 1 if head > 0 else 0,
+    _PLAY: lambda head, pages: head + 1 if head < pages - 1 else head,
+    _NEXT: lambda head, pages: pages - 1,
+}
 
 
 async def try_clear_reactions(msg):
@@ -28,6 +77,31 @@ async def try_clear_reactions(msg):
             pass
 
 
+async def try_remove_reaction(msg, emoji, member):
+    """helper function to remove a member's reaction excepting forbidden
+    either by context being a dm_channel or bot lacking perms"""
+
+    if msg.guild:
+        try:
+            await msg.remove_reaction(emoji, member)
+        except discord.errors.Forbidden:
+            pass
+
+
+async def add_reactions(msg, emojis):
+    """helper function to add reactions concurrently excepting individual ones discord refuses.
+    Missing perms or a deleted message are still raised.
+    All of them share the same rate limit bucket so they are still added in order"""
+
+    results = await asyncio.gather(*(msg.add_reaction(emoji) for emoji in emojis),
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, (discord.errors.Forbidden, discord.errors.NotFound)):
+            raise result
+        if isinstance(result, Exception) and not isinstance(result, discord.HTTPException):
+            raise result
+
+
 async def arrows(ctx: commands.Context,
                  embed_list: List[Embed],
                  content: Optional[str] = None,
@@ -74,43 +148,24 @@ async def arrows(ctx: commands.Context,
     if len(embed_list) == 1:
         return await channel.send(content=content, embed=embed_list[0])
 
+    last = len(embed_list) - 1
+
     def get_reactions(_head: int):
-        _to_react = []
-        emb_range = range(len(embed_list))
-        if _head - 2 in emb_range:
-            _to_react.append(Emoji.LAST_TRACK.value)
-        if _head - 1 in emb_range:
-            _to_react.append(Emoji.REVERSE.value)
-        if _head + 1 in emb_range:
-            _to_react.append(Emoji.PLAY.value)
-        if _head + 2 in emb_range:
-            _to_react.append(Emoji.NEXT_TRACK.value)
-        _to_react += [Emoji.PAUSE.value, Emoji.X.value]
-        return _to_react
+        return _PAGE_REACTIONS[_head >= 2, _head >= 1, _head < last, _head < last - 1]
 
     msg = await channel.send(content=content, embed=embed_list[head])
 
     to_react = get_reactions(head)
-    for emoji in to_react:
-        await msg.add_reaction(emoji)
+    await add_reactions(msg, to_react)
+    to_react_set = frozenset(to_react)
+
+    msg_id = msg.id
+    author_id = ctx.author.id
 
     def check(payload_):
-        return all([
-            msg.id == payload_.message_id,
-            payload_.user_id == ctx.author.id,
-            payload_.emoji.name in to_react,
-        ])
-
-    def get_head(head_: int, emoji_) -> Union[bool, int]:
-        actions = {
-            Emoji.LAST_TRACK: 0,
-            Emoji.REVERSE: head_ - 1 if head_ else 0,
-            Emoji.PLAY: head_ + 1 if head_ < len(embed_list) - 1 else len(embed_list),
-            Emoji.NEXT_TRACK: len(embed_list) - 1,
-            Emoji.X: False,
-            Emoji.PAUSE: True,
-        }
-        return actions[emoji_]
+        return (payload_.message_id == msg_id
+                and payload_.user_id == author_id
+                and payload_.emoji.name in to_react_set)
 
     while True:
         try:
@@ -118,20 +173,45 @@ async def arrows(ctx: commands.Context,
         except asyncio.TimeoutError:
             return await try_clear_reactions(msg)
         else:
-            head = get_head(head, payload.emoji.name)
-            if head is True:  # pause emoji triggered
+            action = _ARROW_ACTIONS[payload.emoji.name]
+            if action == 'pause':
                 return await try_clear_reactions(msg)
 
-            if head is False:  # X emoji triggered
+            if action == 'close':
                 await try_clear_reactions(msg)
                 return await msg.edit(content=None, embed=closed_embed, delete_after=10)
 
+            if action == 'first':
+                head = 0
+            elif action == 'prev':
+                head = head - 1 if head else 0
+            elif action == 'next':
+                head = head + 1 if head < last else head
             else:
+                head = last
+
+            await msg.edit(embed=embed_list[head])
+            previous, to_react = to_react, get_reactions(head)
+            to_react_set = frozenset(to_react)
+            # discord appends new reactions at the end, so only the leading reactions
+            # already in the right order can stay in place
+            kept = [emoji for emoji in previous if emoji in to_react_set]
+            common = 0
+            while common < len(kept) and kept[common] == to_react[common]:
+                common += 1
+            to_remove = [emoji for emoji in previous if emoji not in to_react_set] + kept[common:]
+            to_add = to_react[common:]
+            if len(to_remove) + len(to_add) > len(to_react):
+                # clearing and adding everything again takes fewer requests
                 await try_clear_reactions(msg)
-                await msg.edit(embed=embed_list[head])
-                to_react = get_reactions(head)
-                for emoji in to_react:
-                    await msg.add_reaction(emoji)
+                await add_reactions(msg, to_react)
+            else:
+                await asyncio.gather(
+                    try_remove_reaction(msg, payload.emoji.name,
+                                        discord.Object(id=payload.user_id)),
+                    *(msg.remove_reaction(emoji, ctx.bot.user) for emoji in to_remove),
+                )
+                await add_reactions(msg, to_add)
 
 
 async def confirm(ctx: commands.Context,
@@ -183,24 +263,30 @@ async def confirm(ctx: commands.Context,
                 await msg.edit(content='Timeout')
     """
 
-    emojis = ['👍', '❌']
-    for emoji in emojis:
-        await msg.add_reaction(emoji)
+    await add_reactions(msg, _CONFIRM_REACTIONS)
+
+    msg_id = msg.id
+    author_id = ctx.author.id
+    bot_id = ctx.bot.user.id
+    lock_id = getattr(lock, 'id', None)
 
     def check(payload):
-        _checks = [
-            payload.user_id != ctx.bot.user.id,
-            payload.emoji.name in emojis,
-            payload.message_id == msg.id,
-        ]
-        if lock:
-            if isinstance(lock, bool):
-                _checks.append(payload.user_id == ctx.author.id)
-            elif isinstance(lock, discord.Member):
-                _checks.append(payload.user_id == lock.id)
-            elif isinstance(lock, discord.Role):
-                _checks.append(lock in ctx.guild.get_member(payload.user_id).roles)
-        return all(_checks)
+        if not (payload.message_id == msg_id
+                and payload.user_id != bot_id
+                and payload.emoji.name in _CONFIRM_REACTIONS_SET):
+            return False
+        if not lock:
+            return True
+        if isinstance(lock, bool):
+            return payload.user_id == author_id
+        if isinstance(lock, discord.Member):
+            return payload.user_id == lock_id
+        if isinstance(lock, discord.Role):
+            member = payload.member or ctx.guild.get_member(payload.user_id)
+            # _roles (private) is the sorted id list behind Member.roles, it's searched without
+            # building Role objects but leaves out @everyone, whose id is the guild's id
+            return member is not None and (lock_id == ctx.guild.id or member._roles.has(lock_id))
+        return True
 
     try:
         payload = await ctx.bot.wait_for('raw_reaction_add', check=check, timeout=timeout)
@@ -209,7 +295,7 @@ async def confirm(ctx: commands.Context,
         return None
     else:
         await try_clear_reactions(msg)
-        if payload.emoji.name == '👍':
+        if payload.emoji.name == _THUMBS_UP:
             return True
         else:
             return False
@@ -259,104 +345,86 @@ async def multichoice(ctx: Context,
         raise ValueError("Options cannot be empty")
     elif (t := type(options)) is not list:
         raise TypeError(f'"options" param must be :list: but is {t}')
-    elif not all([type(item) is str for item in options]):
-        raise TypeError(f'All of the "options" param contents must be :str:')
-    elif any([len(opt) > 2000 for opt in options]):
-        raise ValueError("The maximum length for any option is 2000")
+    for opt in options:
+        if type(opt) is not str:
+            raise TypeError(f'All of the "options" param contents must be :str:')
+        if len(opt) > 2000:
+            raise ValueError("The maximum length for any option is 2000")
 
-    multiple = len(options) > 10
     head = 0
-    embeds = []
-    nums = {
-        EmojiNumbers.ONE.value: 0,
-        EmojiNumbers.TWO.value: 1,
-        EmojiNumbers.THREE.value: 2,
-        EmojiNumbers.FOUR.value: 3,
-        EmojiNumbers.FIVE.value: 4,
-        EmojiNumbers.SIX.value: 5,
-        EmojiNumbers.SEVEN.value: 6,
-        EmojiNumbers.EIGHT.value: 7,
-        EmojiNumbers.NINE.value: 8,
-        EmojiNumbers.TEN.value: 9,
-    }
-
-    for i, chunk in enumerate(chunkify_string_list(options, 10, 2000, separator_length=10)):
-        description = "".join(f"{list(nums)[i]} {opt.strip()}\n\n" for i, opt in enumerate(chunk))
-        embed = copy(base_embed)
-        embed.description = description
-        embeds.append((chunk, embed))
+    # options are stripped once for display, the selection still returns the original string
+    labels = [opt.strip() for opt in options]
+    chunks = list(chunkify_string_list(labels, 10, 2000, separator_length=10))
+    starts = list(accumulate(map(len, chunks), initial=0))
+    multiple = len(chunks) > 1
+    # a single embed is reused for every page, base_embed itself is never modified
+    embed = Embed.from_dict(base_embed.to_dict())
+
+    def get_embed(head_: int) -> Embed:
+        """sets the description and footer of the embed to the page :head_:"""
+        lines = [f"{num} {label}" for num, label in zip(_NUM_EMOJIS, chunks[head_])]
+        embed.description = "\n\n".join(lines) + "\n\n"
+        embed.set_footer(text=f"Page {head_ + 1}/{len(chunks)}")
+        return embed
 
     def get_nums(_chunk):
-        return list(nums)[:len(_chunk)]
+        return list(_NUM_EMOJIS[:len(_chunk)])
 
     def get_reactions():
-        to_react = get_nums(embeds[head][0])
+        to_react = get_nums(chunks[head])
         if multiple:
-            if head not in [0, len(embeds) - 1]:
-                to_react = [Emoji.LAST_TRACK, Emoji.REVERSE] + to_react + [Emoji.PLAY, Emoji.NEXT_TRACK]
+            if head not in [0, len(chunks) - 1]:
+                to_react = [_LAST, _REV] + to_react + [_PLAY, _NEXT]
             elif head == 0:
-                to_react = to_react + [Emoji.PLAY, Emoji.NEXT_TRACK]
-            elif head == len(embeds) - 1:
-                to_react = [Emoji.LAST_TRACK, Emoji.REVERSE] + to_react
-        return to_react + [Emoji.X]
-
-    def adjust_head(head_: int, emoji: str):
-        if not multiple:
-            return
-        else:
-            if emoji == Emoji.LAST_TRACK:
-                head_ = 0
-            elif emoji == Emoji.REVERSE:
-                head_ -= 1 if head_ > 0 else 0
-            elif emoji == Emoji.PLAY:
-                head_ += 1 if head_ < len(embeds) - 1 else 0
-            elif emoji == Emoji.NEXT_TRACK:
-                head_ = len(embeds) - 1
-        return head_
-
-    def check(reaction: discord.Reaction,
-              user: Union[discord.User, discord.Member]):
-
-        return all([
-            user != ctx.bot.user,
-            user == ctx.author,
-            ctx.channel == reaction.message.channel,
-            reaction.emoji in to_react,
-        ])
+                to_react = to_react + [_PLAY, _NEXT]
+            elif head == len(chunks) - 1:
+                to_react = [_LAST, _REV] + to_react
+        return to_react + [_X]
 
     to_react = get_reactions()
-    first_embed = embeds[0][1]
-    first_embed.set_footer(text=f"Page 1/{len(embeds)}")
-    msg = await ctx.send(embed=first_embed)
+    to_react_set = frozenset(to_react)
+    msg = await ctx.send(embed=get_embed(head))
+
+    await add_reactions(msg, to_react)
 
-    for reaction in to_react:
-        await msg.add_reaction(reaction)
+    msg_id = msg.id
+    author_id = ctx.author.id
+
+    def check(payload_):
+        return (payload_.message_id == msg_id
+                and payload_.user_id == author_id
+                and payload_.emoji.name in to_react_set)
 
     while True:
         try:
-            reaction, user = await ctx.bot.wait_for('reaction_add', check=check, timeout=timeout)
+            payload = await ctx.bot.wait_for('raw_reaction_add', check=check, timeout=timeout)
         except asyncio.TimeoutError:
             await msg.delete()
             return
         else:
-            emoji = reaction.emoji
-            if emoji == Emoji.X:
+            emoji = payload.emoji.name
+            if emoji == _X:
                 await msg.delete()
                 return
             else:
-                if emoji in nums:
-                    await msg.delete()
-                    return embeds[head][0][nums[emoji]]
+                if emoji in _NUM_EMOJIS:
+                    # old reactions stay if they can't be cleared (dm or missing perms)
+                    idx = _NUM_EMOJIS.index(emoji)
+                    if idx < len(chunks[head]):
+                        await msg.delete()
+                        return options[starts[head] + idx]
                 else:
-                    head = adjust_head(head, emoji)
-                    next_embed = embeds[head][1]
-                    next_embed.set_footer(text=f"Page {head + 1}/{len(embeds)}")
-                    await msg.edit(embed=next_embed)
-                    try:
-                        await msg.clear_reactions()
-                    except discord.errors.Forbidden:
-                        pass
-                    else:
-                        to_react = get_reactions()
-                        for reaction in to_react:
-                            await msg.add_reaction(reaction)
+                    head = _MULTICHOICE_ADJUST[emoji](head, len(chunks))
+                    # edit and clear are independent, only the new reactions wait for the clear
+                    edited, cleared = await asyncio.gather(msg.edit(embed=get_embed(head)),
+                                                           msg.clear_reactions(),
+                                                           return_exceptions=True)
+                    if isinstance(edited, Exception):
+                        raise edited
+                    if isinstance(cleared, discord.errors.Forbidden):
+                        continue
+                    if isinstance(cleared, Exception):
+                        raise cleared
+                    to_react = get_reactions()
+                    to_react_set = frozenset(to_react)
+                    await add_reactions(msg, to_react)